@@ -1,23 +1,36 @@
 import re
+import functools
+import hashlib
 from mdformat import text as mdformat_text
 import os
+import orjson
 import yaml
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader
 import webbrowser
+import socket
 import socketserver
+import stat
 import threading
 import signal
 import time
 import subprocess
-import json
+import urllib.parse
+from http import HTTPStatus
 from http.server import SimpleHTTPRequestHandler
-from jinja2 import Template
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
 from markdown_it import MarkdownIt
 from markdownify import markdownify as md
+from selectolax.lexbor import LexborHTMLParser
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 import shutil
 import typer
-from bs4 import BeautifulSoup
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
 
 app = typer.Typer(help="Live preview GitHub issue template YAML", add_completion=False)
 
@@ -30,11 +43,71 @@ HTML_TEMPLATE = STYLE_DIR / "github-issue-template.html"
 CSS_TEMPLATE = STYLE_DIR / "github-issue-template.css"
 CURRENT_DIR = Path.cwd()
 
+# Content hash of the stylesheet: its ETag and its cache-busting URL version
+_CSS_ETAG = hashlib.blake2b(CSS_TEMPLATE.read_bytes(), digest_size=8).hexdigest()
+
+# Compiled templates are kept by the environment and their bytecode is cached
+# on disk, so neither reloads nor new invocations need to reparse the template.
+_ENV = Environment(
+    loader=FileSystemLoader(str(STYLE_DIR)),
+    bytecode_cache=FileSystemBytecodeCache(),
+)
+
+
+# Top-level fields the template always expects, with factories for their defaults
+_DEFAULTS = (
+    ("assignees", list),
+    ("labels", list),
+    ("projects", list),
+    ("milestone", str),
+    ("title", str),
+)
+
+# Shared CommonMark parser for template fields
+_MD = MarkdownIt()
+
+# Largest /export request body accepted, in bytes
+MAX_EXPORT = 16 * 1024 * 1024
+
+# Quiet period that collapses an editor's burst of writes into one render
+DEBOUNCE_SECONDS = 0.15
+
+# Parsed YAML per file, keyed by the mtime it was parsed at
+_YAML_CACHE: dict[Path, tuple[int, dict]] = {}
+
+# Numbered list item prefixes, used to restore numbering after mdformat
+_NUM_RE = re.compile(r"^(\s*)(\d+)\.\s+")
+_ONE_RE = re.compile(r"^(\s*)1\.\s+")
+
+# Elements with specific tags AND id ending with -not-exported, dropped on export
+_STRIP_TAGS = ["div", "section", "p", "e", "button", "span"]
+_STRIP_RE = re.compile(
+    r'<({tags})[^>]*id="[^"]*-not-exported"[^>]*>.*?</\1>'.format(
+        tags="|".join(_STRIP_TAGS)
+    ),
+    re.DOTALL | re.IGNORECASE,
+)
+
 
 # =============================
 # Utility Functions
 # =============================
+def port_is_free(port: int) -> bool:
+    """Return True if the port can be bound, i.e. no process is listening on it."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        # Match the server's allow_reuse_address so TIME_WAIT sockets don't count
+        s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            s.bind(("localhost", port))
+        except OSError:
+            return False
+    return True
+
+
 def free_port(port: int):
+    # Only spawn lsof when something is actually holding the port
+    if port_is_free(port):
+        return
     try:
         pid_output = subprocess.check_output(
             ["lsof", "-ti", f":{port}"], text=True
@@ -48,9 +121,9 @@ def free_port(port: int):
         pass
 
 
-def cleanup(temp_html: Path, css_file: Path, reload_file: Path, port: int):
+def cleanup(temp_html: Path, css_file: Path, port: int):
     """Remove temporary files and release resources"""
-    for path in [temp_html, css_file, reload_file]:
+    for path in [temp_html, css_file]:
         if path.exists():
             try:
                 path.unlink()
@@ -60,68 +133,110 @@ def cleanup(temp_html: Path, css_file: Path, reload_file: Path, port: int):
     free_port(port)
 
 
+@functools.lru_cache(maxsize=256)
+def render_markdown(src: str) -> str:
+    """Render Markdown to HTML, memoized so unchanged fields skip parsing on reload."""
+    return _MD.render(src)
+
+
+def load_yaml(yaml_file: Path) -> dict:
+    """
+    Parse a YAML file, reusing the previous result while its mtime is unchanged.
+
+    The returned dict is shared between calls; generate_html only adds derived
+    keys to it, which is safe to repeat on the same data.
+    """
+    mtime = os.stat(yaml_file).st_mtime_ns
+    cached = _YAML_CACHE.get(yaml_file)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    with open(yaml_file, "r") as f:
+        data = yaml.load(f, Loader=SafeLoader)
+    _YAML_CACHE[yaml_file] = (mtime, data)
+    return data
+
+
+def write_atomic(path: Path, data: bytes):
+    """Write bytes via a temporary file and rename, so readers never see a partial file."""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    # Mode 0666 lets the umask apply, exactly as it would for open()/write_text
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with open(fd, "wb") as f:
+            f.write(data)
+        try:
+            # Writing in place would have kept an existing file's mode
+            os.chmod(tmp, stat.S_IMODE(os.stat(path).st_mode))
+        except FileNotFoundError:
+            pass
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def copy_css(css_file: Path, dest_dir: Path) -> Path:
+    """
+    Copy the stylesheet next to the preview unless an identical copy is already there.
+
+    Contents are compared rather than mtimes: the served copy must match the
+    packaged file, since its ETag and ``?v=`` URL are hashed from the latter.
+    """
+    css_dest = dest_dir / css_file.name
+    if not css_dest.exists() or css_dest.read_bytes() != css_file.read_bytes():
+        shutil.copy2(css_file, css_dest)
+    return css_dest
+
+
 def generate_html(
     yaml_file: Path,
     html_file: Path,
     css_file: Path,
-    reload_file: Path,
-    html_template: str,
 ):
     """
     Render YAML as HTML using Jinja2 template.
 
     Loads data from a YAML file, updates it with default fields, renders it to HTML using
-    the provided Jinja2 template, copies the CSS file, and writes the output HTML and reload
-    timestamp files.
+    the packaged Jinja2 template, and writes the output HTML file. The CSS file is
+    expected to have been copied next to it with copy_css.
 
     Args:
         yaml_file (Path): Path to the input YAML file.
         html_file (Path): Path to the output HTML file.
-        css_file (Path): Path to the CSS file to copy.
-        reload_file (Path): Path to the reload timestamp file.
-        html_template (str): Jinja2 template string for HTML rendering.
+        css_file (Path): Path to the CSS file linked from the HTML.
     """
-    css_dest = html_file.parent / css_file.name
-    shutil.copy2(css_file, css_dest)
+    data = load_yaml(yaml_file)
 
-    with open(yaml_file, "r") as f:
-        data = yaml.safe_load(f)
+    # Process markdown content in body elements
+    for item in data.get("body") or ():
+        attrs = item.get("attributes")
+        if not attrs:
+            continue
 
-    # Initialize markdown parser
-    md = MarkdownIt()
+        if item.get("type") == "markdown":
+            value = attrs.get("value")
+            if value:
+                attrs["html"] = render_markdown(value)
 
-    # Process markdown content in body elements
-    if "body" in data:
-        for item in data["body"]:
-            if item.get("type") == "markdown" and "attributes" in item:
-                if "value" in item["attributes"]:
-                    item["attributes"]["html"] = md.render(item["attributes"]["value"])
-
-            # Parse description field as markdown for all item types
-            if "attributes" in item and "description" in item["attributes"]:
-                desc = item["attributes"]["description"]
-                if desc:
-                    item["attributes"]["description_html"] = md.render(desc)
+        # Parse description field as markdown for all item types
+        desc = attrs.get("description")
+        if desc:
+            attrs["description_html"] = render_markdown(desc)
 
     # Process top-level description field as markdown if it exists
     if "description" in data and data["description"]:
-        data["description_html"] = md.render(data["description"])
+        data["description_html"] = render_markdown(data["description"])
     else:
         data["description_html"] = ""
 
-    data.update(
-        {
-            "assignees": data.get("assignees", []),
-            "labels": data.get("labels", []),
-            "projects": data.get("projects", []),
-            "milestone": data.get("milestone", ""),
-            "title": data.get("title", ""),
-        }
-    )
-
-    html = Template(html_template).render(css=css_file.name, **data)
-    html_file.write_text(html, encoding="utf-8")
-    reload_file.write_text(str(time.time()), encoding="utf-8")
+    for key, default in _DEFAULTS:
+        data.setdefault(key, default())
+
+    # The version query changes with the CSS content, so the browser may cache it forever
+    css_url = f"{css_file.name}?v={_CSS_ETAG}"
+    html = _ENV.get_template(HTML_TEMPLATE.name).render(css=css_url, **data)
+    write_atomic(html_file, html.encode("utf-8"))
     print(f"Rendered {html_file}")
 
 
@@ -137,27 +252,26 @@ def hybrid_markdown_formatter(original_md: str) -> str:
         return original_md
 
     # 2️⃣ Extract original list numbering
-    # Map: line index (without blank lines) → actual number
-    original_numbers = {}
-    for idx, line in enumerate(original_md.splitlines()):
-        m = re.match(r"^(\s*)(\d+)\.\s+", line)
+    # Numbers of the original list items, in document order
+    original_numbers = []
+    for line in original_md.splitlines():
+        m = _NUM_RE.match(line)
         if m:
-            original_numbers[idx] = int(m.group(2))
+            original_numbers.append(int(m.group(2)))
 
     # 3️⃣ Reinsert numbers back into formatted markdown
     formatted_lines = formatted.splitlines()
     new_lines = []
-    num_iter = iter(original_numbers.values())
+    num_iter = iter(original_numbers)
     current_num = None
 
     for line in formatted_lines:
-        m = re.match(r"^(\s*)1\.\s+", line)
+        m = _ONE_RE.match(line)
         if m:
             try:
                 # Replace "1." with actual original number
                 current_num = next(num_iter)
-                prefix = f"{m.group(1)}{current_num}. "
-                line = re.sub(r"^(\s*)1\.\s+", prefix, line)
+                line = f"{m.group(1)}{current_num}. " + line[m.end():]
             except StopIteration:
                 pass
         new_lines.append(line)
@@ -169,36 +283,83 @@ def hybrid_markdown_formatter(original_md: str) -> str:
 # HTTP Server
 # =============================
 class ThreadedTCPServer(socketserver.ThreadingTCPServer):
+    # Daemon worker threads let shutdown proceed while keep-alive
+    # connections from the browser are still open. (Not HTTPServer: its
+    # server_bind calls socket.getfqdn(), which can stall startup on macOS.)
+    daemon_threads = True
     allow_reuse_address = True
-    reload_file: Optional[Path] = None
+    # Polled by the browser via /reload.txt; replaced (never mutated) on every render
+    reload_token: Optional[str] = None
     yaml_file: Optional[Path] = None
     output_path: Optional[Path] = None
 
 
 class Handler(SimpleHTTPRequestHandler):
+    # Keep connections alive so reload polling and asset fetches reuse one
+    # socket (and one worker thread) instead of reconnecting every request.
+    # Every response must therefore carry a Content-Length.
+    protocol_version = "HTTP/1.1"
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, directory=os.getcwd(), **kwargs)
-        self.reload_file = None
 
     server: ThreadedTCPServer
 
     def log_message(self, format, *args):
         pass
 
+    def send_head(self):
+        if urllib.parse.urlsplit(self.path).path == f"/{CSS_TEMPLATE.name}":
+            return self.send_css_head()
+        return super().send_head()
+
+    def send_css_head(self):
+        """Send headers for the stylesheet, with its ETag and long-lived caching."""
+        etag = f'"{_CSS_ETAG}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "public, max-age=31536000, immutable")
+            self.end_headers()
+            return None
+
+        try:
+            f = open(self.translate_path(self.path), "rb")
+        except OSError:
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return None
+        try:
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-type", "text/css")
+            self.send_header("Content-Length", str(os.fstat(f.fileno()).st_size))
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "public, max-age=31536000, immutable")
+            self.end_headers()
+            return f
+        except Exception:
+            f.close()
+            raise
+
+    def copyfile(self, source, outputfile):
+        # socket.sendfile() uses zero-copy os.sendfile() where available and
+        # falls back to plain send() for non-regular files or other platforms
+        if outputfile is self.wfile:
+            self.connection.sendfile(source)
+        else:
+            super().copyfile(source, outputfile)
+
     def do_GET(self):
         if self.path.startswith("/reload.txt"):
-            try:
-                if self.server.reload_file is None:
-                    self.send_error(404)
-                    return
-                with open(self.server.reload_file, "r") as f:
-                    content = f.read()
-                self.send_response(200)
-                self.send_header("Content-type", "text/plain")
-                self.end_headers()
-                self.wfile.write(content.encode("utf-8"))
-            except Exception:
+            reload_token = self.server.reload_token
+            if reload_token is None:
                 self.send_error(404)
+                return
+            content = reload_token.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-type", "text/plain")
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
         else:
             super().do_GET()
 
@@ -207,33 +368,39 @@ class Handler(SimpleHTTPRequestHandler):
         if self.path == "/export":
             try:
                 # Read the POST data
-                content_length = int(self.headers.get("Content-Length", 0))
-                post_data = self.rfile.read(content_length).decode("utf-8")
-                data = json.loads(post_data)
+                # Refuse bad lengths before reading anything; send_error closes
+                # the connection, so no unread body is left on it
+                try:
+                    content_length = int(self.headers.get("Content-Length", 0))
+                except ValueError:
+                    content_length = -1
+                if content_length < 0:
+                    self.send_error(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+                    return
+                if content_length > MAX_EXPORT:
+                    self.send_error(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+                    return
+                data = orjson.loads(self.rfile.read(content_length))
 
                 html_content = data.get("html", "")
 
                 # Remove elements with specific tags AND id ending with -not-exported
-                tags_to_remove = ["div", "section", "p", "e", "button", "span"]
-                pattern = (
-                    r'<({tags})[^>]*id="[^"]*-not-exported"[^>]*>.*?</\1>'.format(
-                        tags="|".join(tags_to_remove)
-                    )
-                )
-
-                html_content = re.sub(pattern, "", html_content, flags=re.DOTALL | re.IGNORECASE)
+                html_content = _STRIP_RE.sub("", html_content)
 
                 # === Extract <input id="issue-title"> and make it H1 ===
-                soup = BeautifulSoup(html_content, "html.parser")
-                 # 4️⃣ Find issue title input/div/etc.
-                issue_title = soup.find(id="issue-title-exported")
-                if issue_title:
-                    title_text = issue_title.get_text(strip=True)
-                    title_text = title_text.strip()
-                    issue_title.extract()  # safer than decompose for self-closing
+                # Only build a DOM when the payload actually carries a title
+                title_text = ""
+                if 'id="issue-title-exported"' in html_content:
+                    tree = LexborHTMLParser(html_content)
+                    # 4️⃣ Find issue title input/div/etc.
+                    issue_title = tree.css_first("#issue-title-exported")
+                    if issue_title:
+                        title_text = issue_title.text(strip=True)
+                        issue_title.decompose()
+                        html_content = tree.body.html
 
                 # 5️⃣ Convert rest of HTML to Markdown
-                markdown_body = md(str(soup), heading_style="ATX").strip()
+                markdown_body = md(html_content, heading_style="ATX").strip()
 
                 # 6️⃣ Build final Markdown
                 if title_text:
@@ -268,24 +435,142 @@ class Handler(SimpleHTTPRequestHandler):
                         "message": "No valid output path or YAML file available",
                     }
 
+                body = orjson.dumps(response)
                 self.send_response(200)
                 self.send_header("Content-type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
                 self.send_header("Access-Control-Allow-Origin", "*")
                 self.end_headers()
-                self.wfile.write(json.dumps(response).encode("utf-8"))
+                self.wfile.write(body)
 
             except Exception as e:
                 error_response = {"success": False, "message": f"Error: {str(e)}"}
+                body = orjson.dumps(error_response)
                 self.send_response(500)
                 self.send_header("Content-type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
                 self.end_headers()
-                self.wfile.write(json.dumps(error_response).encode("utf-8"))
+                self.wfile.write(body)
         else:
             self.send_error(404)
 
 
 # =============================
-# Typer main function (direct argument version)
+# File Watching
+# =============================
+class YamlChangeHandler(FileSystemEventHandler):
+    """Call ``on_change`` when the watched YAML file is written or replaced."""
+
+    def __init__(self, yaml_file: Path, on_change: Callable[[], None]):
+        super().__init__()
+        self.yaml_file = str(yaml_file)
+        self.on_change = on_change
+
+    def on_modified(self, event):
+        if not event.is_directory and event.src_path == self.yaml_file:
+            self.on_change()
+
+    def on_created(self, event):
+        self.on_modified(event)
+
+    def on_moved(self, event):
+        # Editors that save via "write temp file + rename" show up as a move
+        if not event.is_directory and event.dest_path == self.yaml_file:
+            self.on_change()
+
+
+class DebouncedChange:
+    """
+    Collapse bursts of change events into a single ``on_change`` call.
+
+    Every event restarts a short timer. When it fires, ``on_change`` runs only if
+    the YAML file's mtime differs from the one seen at the previous call.
+    """
+
+    def __init__(
+        self,
+        yaml_file: Path,
+        on_change: Callable[[], None],
+        delay: float = DEBOUNCE_SECONDS,
+    ):
+        self.yaml_file = yaml_file
+        self.on_change = on_change
+        self.delay = delay
+        self.last_mtime_ns = os.stat(yaml_file).st_mtime_ns
+        self._timer: Optional[threading.Timer] = None
+        self._timer_lock = threading.Lock()
+        self._render_lock = threading.Lock()
+
+    def __call__(self):
+        with self._timer_lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.delay, self._fire)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def cancel(self):
+        with self._timer_lock:
+            if self._timer is not None:
+                self._timer.cancel()
+
+    def _fire(self):
+        with self._render_lock:
+            try:
+                mtime_ns = os.stat(self.yaml_file).st_mtime_ns
+            except FileNotFoundError:
+                # Replaced mid-save; the event for the new file re-arms the timer
+                return
+            if mtime_ns == self.last_mtime_ns:
+                return
+            self.last_mtime_ns = mtime_ns
+            self.on_change()
+
+
+def poll_yaml(yaml_file: Path, on_change: Callable[[], None]):
+    """Check the YAML file's mtime once per second and call ``on_change`` on change."""
+    # One stat per tick; st_mtime_ns also catches edits the float mtime rounds away
+    last_mtime_ns = os.stat(yaml_file).st_mtime_ns
+    while True:
+        time.sleep(1)
+        try:
+            st = os.stat(yaml_file)
+        except FileNotFoundError:
+            # Replaced mid-save; check again on the next tick
+            continue
+        if st.st_mtime_ns != last_mtime_ns:
+            last_mtime_ns = st.st_mtime_ns
+            on_change()
+
+
+def watch_yaml(yaml_file: Path, on_change: Callable[[], None]):
+    """
+    Block until interrupted, calling ``on_change`` whenever the YAML file changes.
+
+    Uses a watchdog observer so the process sleeps until the OS reports a change,
+    and falls back to mtime polling when no native observer can be started.
+    """
+    dispatch = DebouncedChange(yaml_file, on_change)
+    observer = Observer()
+    observer.schedule(YamlChangeHandler(yaml_file, dispatch), str(yaml_file.parent))
+    try:
+        observer.start()
+    except OSError as e:
+        typer.echo(f"⚠️ File watcher unavailable ({e}), falling back to polling")
+        poll_yaml(yaml_file, on_change)
+        return
+
+    try:
+        while observer.is_alive():
+            observer.join(1)
+    finally:
+        observer.stop()
+        observer.join()
+        dispatch.cancel()
+
+
+# =============================
+# Typer main function
 # =============================
 
 
@@ -311,22 +596,16 @@ def preview(
         raise typer.Exit(code=1)
 
     html_file = yaml_file.with_suffix(".html")
-    tmp_dir = Path("/tmp")
-    reload_file = (
-        tmp_dir if tmp_dir.exists() else html_file.parent
-    ) / f"{yaml_file.stem}_reload.txt"
 
     # Change to yaml file's directory for relative path resolution
     os.chdir(yaml_file.parent)
     free_port(port)
 
-    with open(HTML_TEMPLATE, "r", encoding="utf-8") as f:
-        html_template = f.read()
-
-    generate_html(yaml_file, html_file, CSS_TEMPLATE, reload_file, html_template)
+    css_file = copy_css(CSS_TEMPLATE, html_file.parent)
+    generate_html(yaml_file, html_file, CSS_TEMPLATE)
 
     server = ThreadedTCPServer(("localhost", port), Handler)
-    server.reload_file = reload_file
+    server.reload_token = str(time.time())
     server.yaml_file = yaml_file
     server.output_path =  (CURRENT_DIR / output_path).resolve()if output_path else None
     thread = threading.Thread(target=server.serve_forever, daemon=True)
@@ -344,22 +623,22 @@ def preview(
 
     typer.echo(f"✅ Live preview running at {url}. Press Ctrl+C to stop...")
 
-    last_mtime = yaml_file.stat().st_mtime
+    def on_change():
+        typer.echo("♻️ YAML changed, updating preview...")
+        try:
+            generate_html(yaml_file, html_file, CSS_TEMPLATE)
+            server.reload_token = str(time.time())
+        except Exception as e:
+            # Keep watching so the preview recovers once the YAML is fixed
+            typer.echo(f"⚠️ Failed to render {yaml_file.name}: {e}")
+
     try:
-        while True:
-            time.sleep(1)
-            if yaml_file.stat().st_mtime != last_mtime:
-                typer.echo("♻️ YAML changed, updating preview...")
-                generate_html(
-                    yaml_file, html_file, CSS_TEMPLATE, reload_file, html_template
-                )
-                last_mtime = yaml_file.stat().st_mtime
+        watch_yaml(yaml_file, on_change)
     except KeyboardInterrupt:
-        css_file = html_file.parent / CSS_TEMPLATE.name
         typer.echo("\n🛑 Shutting down server...")
         server.shutdown()
         server.server_close()
-        cleanup(html_file, css_file, reload_file, port)
+        cleanup(html_file, css_file, port)
         typer.echo("✅ Port released. Goodbye!")
 
 